@@ -0,0 +1,160 @@
+# benchmark_particoes.py
+
+import sys
+import time
+import random
+import contextlib
+import io
+from functools import partial
+
+import carrega_dados
+import estruturas
+import consultas
+import consultas_distribuidas
+
+# --- Constantes de Configuração ---
+RATINGS_FILE = 'minirating.csv'
+PLAYERS_FILE = 'players.csv'
+TAGS_FILE = 'tags.csv'
+
+# Números de partições medidos (pode ser alterado pela linha de comando: py benchmark_particoes.py 1 2 4)
+SHARD_COUNTS = [1, 2, 4, 8]
+# Quantidade de consultas de cada tipo na carga de trabalho
+QUERIES_PER_TYPE = 200
+RANDOM_SEED = 2024
+
+def build_workload(players_df, ratings_df, tags_df) -> list[tuple]:
+
+    # Monta uma carga de trabalho fixa com consultas 'player', 'user', 'top' e 'tags'.
+
+    # Retornos:
+    #     list[tuple]: Lista de (tipo_da_consulta, argumentos).
+
+    rng = random.Random(RANDOM_SEED)
+    names = list(players_df['long_name'])
+    users = list(ratings_df['user_id'].unique())
+    positions = ['GK', 'CB', 'LB', 'RB', 'CDM', 'CM', 'CAM', 'LM', 'RM', 'LW', 'RW', 'CF', 'ST']
+    tags = list(tags_df['tag'].dropna().astype(str).value_counts().index[:30])
+
+    workload = []
+    for _ in range(QUERIES_PER_TYPE):
+        workload.append(('player', (rng.choice(names)[:rng.randint(1, 4)],)))
+        workload.append(('user', (int(rng.choice(users)),)))
+        workload.append(('top', (rng.choice([5, 10, 50]), rng.choice(positions))))
+        workload.append(('tags', (rng.sample(tags, rng.randint(1, 3)),)))
+    rng.shuffle(workload)
+    return workload
+
+def run_workload(queries: dict, workload: list[tuple]) -> tuple[list, list[float]]:
+
+    # Executa a carga de trabalho e mede a latência de cada consulta.
+
+    # Retornos:
+    #     tuple: (resultados, latências em segundos), na ordem da carga de trabalho.
+
+    results = []
+    latencies = []
+    for query_type, args in workload:
+        start = time.perf_counter()
+        results.append(queries[query_type](*args))
+        latencies.append(time.perf_counter() - start)
+    return results, latencies
+
+def same_answer(query_type, args, expected, result, name_trie, tags_index) -> bool:
+
+    # Compara a resposta particionada com a do processo único.
+    # 'user' e 'top' têm ordem definida e devem ser idênticas. 'player' e 'tags'
+    # devolvem até 20 jogadores de um conjunto sem ordem: se houver menos de 20,
+    # os conjuntos devem ser iguais; senão, basta que todos satisfaçam a consulta.
+
+    if query_type in ('user', 'top'):
+        return expected == result
+    # Compara pelos sofifa_id: os dicionários completos têm campos NaN
+    # (ex: club_name), e NaN nunca é igual a NaN.
+    if len(expected) < consultas_distribuidas.RESULT_LIMIT:
+        return {player['sofifa_id'] for player in expected} == {player['sofifa_id'] for player in result}
+    if len(result) != len(expected):
+        return False
+    if query_type == 'player':
+        valid_ids = set(name_trie.search_prefix(args[0]))
+    else:
+        valid_ids = set.intersection(*(tags_index.get(tag.lower(), set()) for tag in args[0]))
+    return all(player['sofifa_id'] in valid_ids for player in result)
+
+def percentile(values: list[float], p: float) -> float:
+    # Percentil simples (vizinho mais próximo) de uma lista de valores.
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+def print_row(label, setup_time, latencies, mismatches):
+    total = sum(latencies)
+    print(f"{label:>10} | {setup_time:9.3f} | {1000 * total / len(latencies):9.3f} | "
+          f"{1000 * percentile(latencies, 0.95):9.3f} | {len(latencies) / total:10.1f} | {mismatches:>11}")
+
+def main():
+
+    # Mede carregamento, latência e vazão das consultas para cada número de partições,
+    # conferindo se as respostas são as mesmas do processo único.
+
+    shard_counts = [int(arg) for arg in sys.argv[1:]] or SHARD_COUNTS
+
+    print("--- Benchmark de consultas particionadas ---")
+    setup_start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        players_df = carrega_dados.load_players(PLAYERS_FILE)
+        ratings_df = carrega_dados.load_ratings(RATINGS_FILE)
+        tags_df = carrega_dados.load_tags(TAGS_FILE)
+    if any(df is None for df in [players_df, ratings_df, tags_df]):
+        print("Falha no carregamento de um ou mais arquivos. Abortando a execução.")
+        return
+
+    workload = build_workload(players_df, ratings_df, tags_df)
+    with contextlib.redirect_stdout(io.StringIO()):
+        player_id_hash = estruturas.create_player_id_hash(players_df)
+        player_name_trie = estruturas.create_player_name_trie(players_df)
+        user_ratings_index = estruturas.create_user_ratings_inverted_index(ratings_df)
+        position_ratings_index = estruturas.create_position_ratings(players_df, ratings_df)
+        tags_index = estruturas.create_tags_inverted_index(tags_df)
+    setup_time = time.perf_counter() - setup_start_time
+
+    local_queries = {
+        'player': partial(consultas.search_players_by_prefix, player_name_trie, player_id_hash),
+        'user': partial(consultas.search_top_rated_players_by_user, user_ratings_index, player_id_hash),
+        'top': partial(consultas.search_top_players_by_position, position_ratings_index, player_id_hash),
+        'tags': partial(consultas.search_players_by_tags, tags_index, player_id_hash),
+    }
+    expected, latencies = run_workload(local_queries, workload)
+
+    print(f"{len(workload)} consultas ({QUERIES_PER_TYPE} de cada tipo), arquivo de ratings '{RATINGS_FILE}'.")
+    print(f"{'partições':>10} | {'carga (s)':>9} | {'média(ms)':>9} | {'p95 (ms)':>9} | {'consultas/s':>10} | {'divergências':>11}")
+    print("-" * 75)
+    print_row('local', setup_time, latencies, 0)
+
+    for num_shards in shard_counts:
+        setup_start_time = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            coordinator = consultas_distribuidas.create_shard_coordinator(num_shards, PLAYERS_FILE, RATINGS_FILE, TAGS_FILE)
+        if coordinator is None:
+            print(f"Falha ao iniciar {num_shards} partições.")
+            continue
+        setup_time = time.perf_counter() - setup_start_time
+        try:
+            sharded_queries = {
+                'player': coordinator.search_players_by_prefix,
+                'user': coordinator.search_top_rated_players_by_user,
+                'top': coordinator.search_top_players_by_position,
+                'tags': coordinator.search_players_by_tags,
+            }
+            results, latencies = run_workload(sharded_queries, workload)
+        finally:
+            coordinator.close()
+
+        mismatches = sum(
+            not same_answer(query_type, args, exp, res, player_name_trie, tags_index)
+            for (query_type, args), exp, res in zip(workload, expected, results)
+        )
+        print_row(num_shards, setup_time, latencies, mismatches)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+# consultas_distribuidas.py
+
+import contextlib
+import heapq
+import io
+import multiprocessing as mp
+from itertools import islice
+
+import pandas as pd
+
+import estruturas
+import consultas
+
+# Quantidade de linhas lidas por vez dos arquivos .csv. Cada processo só mantém
+# em memória as linhas da sua partição, então o pico de memória fica limitado
+# ao tamanho da partição mais um bloco de leitura.
+CHUNK_SIZE = 100_000
+
+# Limite de resultados das consultas 'player', 'user' e 'tags' (igual a consultas.py).
+RESULT_LIMIT = 20
+
+# --- Particionamento ---
+
+def shard_of(sofifa_id: int, num_shards: int) -> int:
+
+    # Retorna a partição responsável por um jogador (hash do sofifa_id).
+    # Para IDs inteiros não negativos, hash(x) == x, então usamos o resto direto;
+    # a mesma fórmula é aplicada de forma vetorizada em load_shard.
+
+    # Argumentos:
+    #     sofifa_id (int): O ID do jogador.
+    #     num_shards (int): O número total de partições.
+
+    # Retornos:
+    #     int: O índice da partição, entre 0 e num_shards - 1.
+
+    return int(sofifa_id) % num_shards
+
+def load_shard(file_path: str, shard_id: int, num_shards: int, **read_csv_args) -> pd.DataFrame:
+
+    # Lê um arquivo .csv em blocos e mantém apenas as linhas da partição.
+
+    # Argumentos:
+    #     file_path (str): O caminho para o arquivo .csv (precisa ter a coluna sofifa_id).
+    #     shard_id (int): O índice da partição a ser mantida.
+    #     num_shards (int): O número total de partições.
+
+    # Retornos:
+    #     pd.DataFrame: As linhas da partição. O índice preserva o número da linha
+    #                   no arquivo original, usado para desempatar os resultados.
+
+    chunks = []
+    for chunk in pd.read_csv(file_path, chunksize=CHUNK_SIZE, **read_csv_args):
+        chunks.append(chunk[chunk['sofifa_id'] % num_shards == shard_id])
+    if not chunks:
+        # Arquivo só com o cabeçalho: nenhum bloco é lido
+        return pd.read_csv(file_path, nrows=0, **read_csv_args)
+    return pd.concat(chunks)
+
+# --- Processo trabalhador (uma partição) ---
+
+class Shard:
+    # Estruturas de uma partição, construídas com as mesmas funções de estruturas.py.
+    def __init__(self, players_df: pd.DataFrame, ratings_df: pd.DataFrame, tags_df: pd.DataFrame):
+        # As funções de estruturas.py imprimem o progresso; em N processos isso só polui o console.
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.player_hash = estruturas.create_player_id_hash(players_df)
+            self.name_trie = estruturas.create_player_name_trie(players_df)
+            self.position_ratings = estruturas.create_position_ratings(players_df, ratings_df)
+            self.tags_index = estruturas.create_tags_inverted_index(tags_df)
+
+        # Linha original de cada jogador, para desempatar médias iguais entre partições
+        self.player_row = dict(zip(players_df['sofifa_id'], players_df.index))
+
+        # Avaliações por usuário no formato [(rating, linha, sofifa_id), ...]. É o mesmo
+        # índice de estruturas.py, mas guardando a linha original para o desempate.
+        self.user_ratings = {}
+        for user_id, group in ratings_df.groupby('user_id'):
+            ratings_list = list(zip(group['rating'], group.index, group['sofifa_id']))
+            ratings_list.sort(key=lambda x: x[0], reverse=True)
+            self.user_ratings[user_id] = ratings_list
+
+    def player(self, prefix: str) -> list[dict]:
+        # Resultados parciais da busca por prefixo (até RESULT_LIMIT por partição).
+        return consultas.search_players_by_prefix(self.name_trie, self.player_hash, prefix)
+
+    def user(self, user_id: int) -> list[tuple]:
+        # Top avaliações do usuário nesta partição: [(rating, linha, jogador | None), ...].
+        # Jogadores fora da tabela hash são mantidos como None e descartados pelo
+        # coordenador só depois do corte, como em consultas.py.
+        results = []
+        for rating, row, player_id in self.user_ratings.get(user_id, [])[:RESULT_LIMIT]:
+            player_data = self.player_hash.get(player_id)
+            player_info = None
+            if player_data:
+                player_info = {
+                    'sofifa_id': player_id,
+                    'long_name': player_data.get('long_name'),
+                    'player_positions': player_data.get('player_positions'),
+                    'rating': rating
+                }
+            results.append((rating, row, player_info))
+        return results
+
+    def top(self, n: int, position: str) -> list[tuple]:
+        # Top 'n' parcial da posição nesta partição: [(media, linha, jogador), ...].
+        # A média sem arredondamento é mantida para o coordenador intercalar as partições.
+        results = []
+        for avg_rating, player_id in self.position_ratings.get(position.upper(), [])[:n]:
+            player_data = self.player_hash[player_id]
+            player_info = {
+                'sofifa_id': player_id,
+                'long_name': player_data.get('long_name'),
+                'player_positions': player_data.get('player_positions'),
+                'average_rating': round(avg_rating, 2)
+            }
+            results.append((avg_rating, self.player_row[player_id], player_info))
+        return results
+
+    def tags(self, tags: list[str]) -> list[int]:
+        # Interseção local das tags. Todas as tags de um jogador ficam na mesma
+        # partição, então a união das interseções locais é a interseção global.
+        if not tags:
+            return []
+        search_tags = [tag.lower() for tag in tags]
+        player_ids = self.tags_index.get(search_tags[0], set()).copy()
+        for tag in search_tags[1:]:
+            player_ids.intersection_update(self.tags_index.get(tag, set()))
+            if not player_ids:
+                break
+        return list(player_ids)[:RESULT_LIMIT]
+
+    def details(self, player_ids: list[int]) -> list[dict]:
+        # Dados completos dos jogadores desta partição.
+        return [
+            {'sofifa_id': player_id, **self.player_hash[player_id]}
+            for player_id in player_ids
+            if player_id in self.player_hash
+        ]
+
+def run_shard(conn, shard_id: int, num_shards: int, players_file: str, ratings_file: str, tags_file: str):
+
+    # Laço principal de um processo trabalhador.
+
+    # Carrega a partição, constrói as estruturas e responde às consultas recebidas
+    # pela conexão até receber 'exit'. Cada resposta é ('ok', resultado) ou
+    # ('erro', mensagem).
+
+    try:
+        players_df = load_shard(players_file, shard_id, num_shards, low_memory=False)
+        ratings_df = load_shard(ratings_file, shard_id, num_shards)
+        tags_df = load_shard(tags_file, shard_id, num_shards)
+        shard = Shard(players_df, ratings_df, tags_df)
+        # Libera os DataFrames; a partir daqui só as estruturas são necessárias
+        del players_df, ratings_df, tags_df
+    except Exception as e:
+        conn.send(('erro', f"Falha ao carregar a partição {shard_id}: {e}"))
+        conn.close()
+        return
+    conn.send(('ok', None))
+
+    while True:
+        try:
+            query_type, args = conn.recv()
+        except EOFError:
+            break
+        if query_type == 'exit':
+            break
+        try:
+            conn.send(('ok', getattr(shard, query_type)(*args)))
+        except Exception as e:
+            conn.send(('erro', f"Partição {shard_id}: {e}"))
+    conn.close()
+
+# --- Coordenador ---
+
+class ShardCoordinator:
+    # Distribui as consultas entre os processos trabalhadores (scatter) e junta
+    # os resultados parciais (gather), devolvendo as mesmas respostas de consultas.py.
+    def __init__(self, num_shards: int, players_file: str, ratings_file: str, tags_file: str):
+        self.num_shards = num_shards
+        # Vira True quando uma partição para de responder; a partir daí as conexões
+        # podem estar fora de sincronia e o coordenador recusa novas consultas.
+        self.broken = False
+        self.connections = []
+        self.processes = []
+        for shard_id in range(num_shards):
+            parent_conn, child_conn = mp.Pipe()
+            process = mp.Process(
+                target=run_shard,
+                args=(child_conn, shard_id, num_shards, players_file, ratings_file, tags_file),
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+            self.connections.append(parent_conn)
+            self.processes.append(process)
+
+    def _gather(self, connections: list) -> list:
+        # Recebe uma resposta de cada conexão, na ordem das partições.
+        # Todas as conexões são lidas mesmo que alguma falhe, para não deixar
+        # respostas pendentes que seriam lidas pela próxima consulta.
+        results = []
+        errors = []
+        for conn in connections:
+            try:
+                status, result = conn.recv()
+            except (EOFError, OSError):
+                self.broken = True
+                errors.append(f"Partição {self.connections.index(conn)} encerrou inesperadamente")
+                continue
+            if status != 'ok':
+                errors.append(result)
+            results.append(result)
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return results
+
+    def _send(self, connections: list, query_type: str, *args) -> list:
+        # Envia a consulta para as conexões e espera todas as respostas.
+        if self.broken:
+            raise RuntimeError("Uma partição parou de responder; reinicie o programa.")
+        sent = []
+        for conn in connections:
+            try:
+                conn.send((query_type, args))
+            except OSError:
+                self.broken = True
+                continue
+            sent.append(conn)
+        results = self._gather(sent)
+        if self.broken:
+            raise RuntimeError("Uma partição parou de responder; reinicie o programa.")
+        return results
+
+    def _scatter(self, query_type: str, *args) -> list:
+        # Envia a consulta para todas as partições e espera todas as respostas.
+        return self._send(self.connections, query_type, *args)
+
+    def wait_ready(self) -> bool:
+        # Espera todas as partições terminarem de carregar.
+        try:
+            self._gather(self.connections)
+        except (RuntimeError, EOFError) as e:
+            print(f"Erro: {e}")
+            return False
+        return True
+
+    def search_players_by_prefix(self, prefix: str) -> list[dict]:
+        # 1. Busca por prefixo: une os resultados parciais e corta em RESULT_LIMIT.
+        if not prefix:
+            return []
+        partials = self._scatter('player', prefix)
+        return [player for partial in partials for player in partial][:RESULT_LIMIT]
+
+    def search_top_rated_players_by_user(self, user_id: int) -> list[dict]:
+        # 3. Top avaliações do usuário: intercala (heap merge) as listas ordenadas de cada partição.
+        partials = self._scatter('user', user_id)
+        merged = heapq.merge(*partials, key=lambda x: (-x[0], x[1]))
+        return [player_info for _, _, player_info in islice(merged, RESULT_LIMIT) if player_info]
+
+    def search_top_players_by_position(self, n: int, position: str) -> list[dict]:
+        # 4. Top 'n' da posição: intercala (heap merge) o top 'n' de cada partição.
+        partials = self._scatter('top', n, position)
+        merged = heapq.merge(*partials, key=lambda x: (-x[0], x[1]))
+        return [player_info for _, _, player_info in islice(merged, n)]
+
+    def search_players_by_tags(self, tags: list[str]) -> list[dict]:
+        # 5. Busca por tags: interseção local em cada partição e união dos IDs.
+        if not tags:
+            return []
+        partials = self._scatter('tags', tags)
+        player_ids = [player_id for partial in partials for player_id in partial][:RESULT_LIMIT]
+
+        # Busca os detalhes só nas partições donas dos IDs escolhidos
+        ids_by_shard = [[] for _ in range(self.num_shards)]
+        for player_id in player_ids:
+            ids_by_shard[shard_of(player_id, self.num_shards)].append(player_id)
+        results = []
+        for shard_id in range(self.num_shards):
+            if ids_by_shard[shard_id]:
+                results.extend(self._send([self.connections[shard_id]], 'details', ids_by_shard[shard_id])[0])
+        return results
+
+    def close(self):
+        # Encerra os processos trabalhadores.
+        for conn in self.connections:
+            try:
+                conn.send(('exit', ()))
+            except (BrokenPipeError, OSError):
+                pass
+            conn.close()
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+
+def create_shard_coordinator(num_shards: int, players_file: str, ratings_file: str, tags_file: str) -> ShardCoordinator | None:
+
+    # Inicia 'num_shards' processos trabalhadores, cada um com a sua partição dos dados.
+
+    # Argumentos:
+    #     num_shards (int): O número de partições (processos).
+    #     players_file (str): O caminho para o arquivo players.csv.
+    #     ratings_file (str): O caminho para o arquivo de ratings.
+    #     tags_file (str): O caminho para o arquivo tags.csv.
+
+    # Retornos:
+    #     ShardCoordinator | None: O coordenador pronto para consultas ou None se
+    #                              alguma partição falhar ao carregar.
+
+    print(f"Iniciando {num_shards} partições em processos separados...")
+    coordinator = ShardCoordinator(num_shards, players_file, ratings_file, tags_file)
+    if not coordinator.wait_ready():
+        coordinator.close()
+        return None
+    print("Partições carregadas com sucesso.")
+    return coordinator
+
+# --- Bloco Principal para Testes ---
+
+if __name__ == '__main__':
+    # Este bloco demonstra o uso do coordenador com 4 partições.
+    import pprint
+
+    coordinator = create_shard_coordinator(4, 'players.csv', 'minirating.csv', 'tags.csv')
+    if coordinator is not None:
+        pp = pprint.PrettyPrinter(indent=2)
+        try:
+            print("\n1. Buscando jogadores com prefixo 'Neymar':")
+            pp.pprint(coordinator.search_players_by_prefix('Neymar'))
+
+            print("\n4. Buscando top 5 jogadores para a posição 'GK':")
+            pp.pprint(coordinator.search_top_players_by_position(5, 'GK'))
+
+            print("\n5. Buscando jogadores com as tags 'Dribbler' e 'Playmaker':")
+            pp.pprint(coordinator.search_players_by_tags(['Dribbler', 'Playmaker']))
+        finally:
+            coordinator.close()
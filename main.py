@@ -3,11 +3,13 @@
 import time
 import re
 import pprint
+from functools import partial
 
 # Importa os módulos
 import carrega_dados
 import estruturas
 import consultas
+import consultas_distribuidas
 
 # --- Constantes de Configuração ---
 # Alterar para 'rating.csv' para usar o arquivo completo.
@@ -15,10 +17,15 @@ import consultas
 RATINGS_FILE = 'minirating.csv'
 PLAYERS_FILE = 'players.csv'
 TAGS_FILE = 'tags.csv'
+# Número de partições (processos). Com 1 tudo roda no processo principal; com mais
+# os jogadores são divididos pelo hash do sofifa_id entre processos trabalhadores.
+NUM_SHARDS = 1
 
-def start_query_loop(player_id_hash, player_name_trie, user_ratings_index, position_ratings_index, tags_index):
+def start_query_loop(search_players_by_prefix, search_top_rated_players_by_user, search_top_players_by_position, search_players_by_tags):
     
     # Inicia o menu interativo para receber e processar as consultas do usuário.
+    # Recebe as funções de consulta já ligadas às estruturas, para que o mesmo laço
+    # sirva tanto para o modo de processo único quanto para o modo particionado.
     
     print("\n--- Menu de Consulta de jogadores da FIFA ---")
     print("O sistema está pronto. Digite suas consultas ou 'exit' para sair.")
@@ -50,14 +57,14 @@ def start_query_loop(player_id_hash, player_name_trie, user_ratings_index, posit
 
             if query_type == 'player' and len(parts) > 1:
                 prefix = " ".join(parts[1:])
-                result = consultas.search_players_by_prefix(player_name_trie, player_id_hash, prefix)
+                result = search_players_by_prefix(prefix)
                 print(f"\nResultados para o prefixo '{prefix}':")
                 pp.pprint(result)
 
             elif query_type == 'user' and len(parts) > 1:
                 try:
                     user_id = int(parts[1])
-                    result = consultas.search_top_rated_players_by_user(user_ratings_index, player_id_hash, user_id)
+                    result = search_top_rated_players_by_user(user_id)
                     print(f"\nTop jogadores avaliados pelo usuário {user_id}:")
                     pp.pprint(result)
                 except ValueError:
@@ -69,7 +76,7 @@ def start_query_loop(player_id_hash, player_name_trie, user_ratings_index, posit
                 if match:
                     n = int(match.group(1))
                     position = match.group(2).upper()
-                    result = consultas.search_top_players_by_position(position_ratings_index, player_id_hash, n, position)
+                    result = search_top_players_by_position(n, position)
                     print(f"\nTop {n} jogadores para a posição {position}:")
                     pp.pprint(result)
                 else:
@@ -79,7 +86,7 @@ def start_query_loop(player_id_hash, player_name_trie, user_ratings_index, posit
                 # Usa regex para encontrar todas as tags entre aspas simples
                 tags_list = re.findall(r"'([^']*)'", command)
                 if tags_list:
-                    result = consultas.search_players_by_tags(tags_index, player_id_hash, tags_list)
+                    result = search_players_by_tags(tags_list)
                     print(f"\nJogadores com as tags: {tags_list}")
                     pp.pprint(result)
                 else:
@@ -109,6 +116,10 @@ def main():
     
     setup_start_time = time.perf_counter()
 
+    if NUM_SHARDS > 1:
+        main_sharded(setup_start_time)
+        return
+
     # 1. Carregar os dados
     players_df = carrega_dados.load_players(PLAYERS_FILE)
     ratings_df = carrega_dados.load_ratings(RATINGS_FILE)
@@ -133,13 +144,39 @@ def main():
 
     # 3. Iniciar o loop de consultas
     start_query_loop(
-        player_id_hash,
-        player_name_trie,
-        user_ratings_index,
-        position_ratings_index,
-        tags_index
+        partial(consultas.search_players_by_prefix, player_name_trie, player_id_hash),
+        partial(consultas.search_top_rated_players_by_user, user_ratings_index, player_id_hash),
+        partial(consultas.search_top_players_by_position, position_ratings_index, player_id_hash),
+        partial(consultas.search_players_by_tags, tags_index, player_id_hash)
     )
 
 
+def main_sharded(setup_start_time):
+
+    # Versão particionada de main(): cada processo trabalhador carrega e indexa
+    # apenas a sua partição, e o coordenador distribui as consultas.
+
+    coordinator = consultas_distribuidas.create_shard_coordinator(NUM_SHARDS, PLAYERS_FILE, RATINGS_FILE, TAGS_FILE)
+    if coordinator is None:
+        print("\nFalha no carregamento de uma ou mais partições. Abortando a execução.")
+        return
+
+    setup_end_time = time.perf_counter()
+
+    print("-" * 40)
+    print(f"Tempo total de carregamento e construção: {setup_end_time - setup_start_time:.4f} segundos.")
+    print("-" * 40)
+
+    try:
+        start_query_loop(
+            coordinator.search_players_by_prefix,
+            coordinator.search_top_rated_players_by_user,
+            coordinator.search_top_players_by_position,
+            coordinator.search_players_by_tags
+        )
+    finally:
+        coordinator.close()
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file